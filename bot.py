@@ -1,47 +1,62 @@
+import hashlib
 import logging
+from functools import lru_cache
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
-from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.helpers import mention_html
+from telegram.ext import AIORateLimiter, Application, CommandHandler, ContextTypes
 import os
 from dotenv import load_dotenv
+from pythonjsonlogger import jsonlogger
 
 # Load environment variables
 load_dotenv()
 
-# Enable logging
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
-)
 logger = logging.getLogger(__name__)
 
 # Bot token from BotFather
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 # Your web app URL (where your FastAPI app is hosted)
 WEB_APP_URL = os.getenv("WEB_APP_URL", "https://your-app-url.com/game")
+# Public base URL of the FastAPI app; when set, Telegram pushes updates to its
+# webhook route instead of the bot polling for them
+PUBLIC_URL = os.getenv("PUBLIC_URL")
+# Secret Telegram sends with each webhook update, derived from the token if
+# unset so every worker agrees on it; Telegram allows [A-Za-z0-9_-] only
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET") or (
+    hashlib.sha256(BOT_TOKEN.encode()).hexdigest() if BOT_TOKEN else None
+)
 
+# Telegram's limit on messages per second for the whole bot
+BOT_MAX_RATE = 30
 
-async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Send a message when the command /start is issued."""
-    user = update.effective_user
-
-    # Create the web app button
-    keyboard = [
-        [
-            InlineKeyboardButton(
-                "🎮 Play Tic-Tac-Toe", web_app=WebAppInfo(url=WEB_APP_URL)
-            )
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+# The web app button is the same for every message, so build it once
+WEB_APP_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("🎮 Play Tic-Tac-Toe", web_app=WebAppInfo(url=WEB_APP_URL))]]
+)
 
-    welcome_message = f"""
-🎉 Welcome to Tic-Tac-Toe, {user.mention_html()}!
+WELCOME_TEMPLATE = """
+🎉 Welcome to Tic-Tac-Toe, {mention}!
 
 Ready to play the classic game right here in Telegram? 
 
 Click the button below to start playing:
     """
 
-    await update.message.reply_html(welcome_message, reply_markup=reply_markup)
+
+@lru_cache(maxsize=10_000)
+def welcome_message_for(user_id: int, full_name: str) -> str:
+    """Render the welcome message, cached for users who /start repeatedly."""
+    return WELCOME_TEMPLATE.format(mention=mention_html(user_id, full_name))
+
+
+async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Send a message when the command /start is issued."""
+    user = update.effective_user
+    logger.info("start_cmd", extra={"user_id": user.id})
+
+    welcome_message = welcome_message_for(user.id, user.full_name)
+
+    await update.message.reply_html(welcome_message, reply_markup=WEB_APP_MARKUP)
 
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -75,17 +90,8 @@ Have fun playing! 🎯
 
 async def play_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send the game directly when /play is issued."""
-    keyboard = [
-        [
-            InlineKeyboardButton(
-                "🎮 Play Tic-Tac-Toe", web_app=WebAppInfo(url=WEB_APP_URL)
-            )
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
     await update.message.reply_text(
-        "🎮 Ready to play Tic-Tac-Toe?", reply_markup=reply_markup
+        "🎮 Ready to play Tic-Tac-Toe?", reply_markup=WEB_APP_MARKUP
     )
 
 
@@ -94,14 +100,41 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     logger.error(msg="Exception while handling an update:", exc_info=context.error)
 
 
-def main() -> None:
-    """Start the bot."""
-    if not BOT_TOKEN:
-        logger.error("BOT_TOKEN not found in environment variables")
-        return
+def rate_limit_share(processes: int) -> tuple[int, float]:
+    """Split Telegram's bot-wide message rate between processes.
 
-    # Create the Application
-    application = Application.builder().token(BOT_TOKEN).build()
+    Returns (max_rate, time_period) for one process's AIORateLimiter. The
+    limiter cannot acquire a message when max_rate is below 1, so with more
+    processes than BOT_MAX_RATE the period is stretched instead.
+    """
+    max_rate = max(1, BOT_MAX_RATE // processes)
+    time_period = max_rate * processes / BOT_MAX_RATE
+    assert max_rate >= 1, "AIORateLimiter cannot acquire with max_rate < 1"
+    return max_rate, time_period
+
+
+def build_application(processes: int = 1) -> Application:
+    """Create the bot Application with all handlers registered.
+
+    processes is how many copies of the bot run at once; they share
+    Telegram's bot-wide message rate.
+    """
+    max_rate, time_period = rate_limit_share(processes)
+    # Handlers only await Telegram API calls, so let updates be processed
+    # concurrently instead of one at a time.
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .rate_limiter(
+            AIORateLimiter(
+                overall_max_rate=max_rate,
+                overall_time_period=time_period,
+                max_retries=3,
+            )
+        )
+        .concurrent_updates(True)
+        .build()
+    )
 
     # Register handlers
     application.add_handler(CommandHandler("start", start))
@@ -111,6 +144,38 @@ def main() -> None:
     # Add error handler
     application.add_error_handler(error_handler)
 
+    return application
+
+
+def configure_logging() -> None:
+    """Enable logging, one JSON object per record on stderr.
+
+    Called by the entry points rather than at import, so importing this
+    module does not reconfigure the web app's logging.
+    """
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(
+        jsonlogger.JsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+    )
+    logging.basicConfig(level=logging.INFO, handlers=[log_handler])
+    # httpx logs every request URL at INFO, and Telegram URLs contain the token
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def main() -> None:
+    """Start the bot."""
+    configure_logging()
+
+    if not BOT_TOKEN:
+        logger.error("BOT_TOKEN not found in environment variables")
+        return
+
+    if PUBLIC_URL:
+        logger.error("PUBLIC_URL is set, updates are delivered to the web app")
+        return
+
+    application = build_application()
+
     # Run the bot until the user presses Ctrl-C
     logger.info("Starting bot...")
     application.run_polling(allowed_updates=Update.ALL_TYPES)
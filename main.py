@@ -1,75 +1,282 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from fastapi.staticfiles import StaticFiles
+from typing import Annotated, Literal, Optional
+import asyncio
+from dataclasses import dataclass, field
+import hashlib
+import hmac
+import logging
+import msgspec
+import orjson
+import os
+from pathlib import Path
+import redis.asyncio as redis
+from redis.exceptions import WatchError
+import secrets
+import time
+from telegram import Update
 import uvicorn
-from datetime import datetime
+import weakref
+
+from bot import BOT_TOKEN, PUBLIC_URL, WEBHOOK_SECRET, build_application
+
+# Log through uvicorn's logger, which uvicorn configures for each worker
+logger = logging.getLogger("uvicorn.error")
+# In webhook mode the bot's httpx client runs here, and it logs every request
+# URL at INFO; Telegram URLs contain the bot token
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+app = FastAPI(
+    title="Telegram Tic-Tac-Toe Mini App", default_response_class=ORJSONResponse
+)
+
+STATIC_DIR = Path(__file__).parent / "static"
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+# The game page never changes while the process runs, so it is read once and
+# served from memory; its ETag lets browsers revalidate with a 304
+GAME_HTML_BYTES = (STATIC_DIR / "game.html").read_bytes()
+GAME_HTML_ETAG = f'"{hashlib.blake2b(GAME_HTML_BYTES, digest_size=8).hexdigest()}"'
+GAME_HTML_HEADERS = {"ETag": GAME_HTML_ETAG, "Cache-Control": "public, max-age=3600"}
+
+# Game state is kept in Redis so every worker process sees the same games
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_MAX_CONNECTIONS = 50
+# Seconds a request waits for a free pooled connection before failing
+REDIS_POOL_TIMEOUT = 5
+# Seconds a game is kept around after its last update; finished games only
+# need to outlive the client's final render
+GAME_TTL = 1800
+FINISHED_GAME_TTL = 60
+
+# Per-game locks serialize moves on the same game within this worker, so
+# concurrent moves queue up instead of repeatedly failing the WATCH check.
+# Locks are weakly referenced and vanish once no request holds them.
+game_locks = weakref.WeakValueDictionary()
+
+# Redis key held by the worker that registers the bot webhook, and for how
+# many seconds, so a deploy's workers do not all call setWebhook at once
+WEBHOOK_LOCK_KEY = "bot:webhook_lock"
+WEBHOOK_LOCK_TTL = 60
+
+
+@dataclass(slots=True)
+class GameState:
+    # Bit i is set when the player occupies board position i
+    x_bits: int = 0
+    o_bits: int = 0
+    current_player: str = "X"
+    winner: Optional[str] = None
+    game_over: bool = False
+    created_at: float = field(default_factory=time.time)
+
+
+class MoveRequest(msgspec.Struct):
+    game_id: str
+    position: Annotated[int, msgspec.Meta(ge=0, le=8)]
+    player: Literal["X", "O"]
 
-app = FastAPI(title="Telegram Tic-Tac-Toe Mini App")
 
-# Game state storage (in production, use a database)
-games = {}
+def msgspec_request_body(struct_type):
+    """OpenAPI requestBody for a route that decodes its body with msgspec
 
+    Such routes take the raw Request, so FastAPI cannot infer the schema.
+    The struct must not nest other structs, as its schema is inlined.
+    """
+    _, components = msgspec.json.schema_components([struct_type])
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": components[struct_type.__name__]}
+            },
+        }
+    }
 
-class GameState(BaseModel):
-    board: List[str]
-    current_player: str
-    winner: Optional[str]
-    game_over: bool
-    created_at: datetime
 
+# Largest number of boards accepted by a single /api/evaluate request; a
+# full batch is evaluated inline in about a millisecond
+MAX_EVALUATE_BOARDS = 1000
 
-class MoveRequest(BaseModel):
-    game_id: str
-    position: int
-    player: str
+# A board in the same cell-list form the game endpoints return
+Board = Annotated[list[Literal["", "X", "O"]], msgspec.Meta(min_length=9, max_length=9)]
 
 
-class GameResponse(BaseModel):
-    game_id: str
-    board: List[str]
-    current_player: str
-    winner: Optional[str]
-    game_over: bool
-    message: str
+class EvaluateRequest(msgspec.Struct):
+    boards: Annotated[list[Board], msgspec.Meta(max_length=MAX_EVALUATE_BOARDS)]
+
+
+# Board positions forming each winning line
+WIN_COMBOS = (
+    (0, 1, 2),
+    (3, 4, 5),
+    (6, 7, 8),  # rows
+    (0, 3, 6),
+    (1, 4, 7),
+    (2, 5, 8),  # columns
+    (0, 4, 8),
+    (2, 4, 6),  # diagonals
+)
+# The same lines as bitmasks over a bitboard
+WIN_MASKS = tuple(sum(1 << i for i in combo) for combo in WIN_COMBOS)
+FULL_BOARD = 0b111111111
 
 
-def check_winner(board):
+# HAS_LINE[bits] tells whether a player occupying `bits` has a winning line,
+# so checking a board is two tuple lookups instead of a loop over WIN_MASKS
+HAS_LINE = tuple(
+    any(bits & mask == mask for mask in WIN_MASKS) for bits in range(FULL_BOARD + 1)
+)
+
+# Outcome codes returned by check_winner_bits
+ONGOING, X_WINS, O_WINS, TIE = range(4)
+OUTCOME_WINNERS = (None, "X", "O", "tie")
+
+
+def check_winner_bits(x_bits, o_bits):
+    """Return the outcome code for a pair of bitboards"""
+    if HAS_LINE[x_bits]:
+        return X_WINS
+    if HAS_LINE[o_bits]:
+        return O_WINS
+    if x_bits | o_bits == FULL_BOARD:
+        return TIE
+    return ONGOING
+
+
+def check_winner(x_bits, o_bits):
     """Check if there's a winner in the current board state"""
-    winning_combinations = [
-        [0, 1, 2],
-        [3, 4, 5],
-        [6, 7, 8],  # rows
-        [0, 3, 6],
-        [1, 4, 7],
-        [2, 5, 8],  # columns
-        [0, 4, 8],
-        [2, 4, 6],  # diagonals
+    return OUTCOME_WINNERS[check_winner_bits(x_bits, o_bits)]
+
+
+def board_to_bits(board):
+    """Convert a list of cells as sent by the client into X/O bitboards"""
+    x_bits = o_bits = 0
+    for i, cell in enumerate(board):
+        if cell == "X":
+            x_bits |= 1 << i
+        elif cell == "O":
+            o_bits |= 1 << i
+    return x_bits, o_bits
+
+
+# Shared rendering of a board nobody has played on yet
+EMPTY_BOARD = ("",) * 9
+
+
+def board_to_list(game):
+    """Render the bitboards as the sequence of cells sent to the client"""
+    if not game.x_bits | game.o_bits:
+        return EMPTY_BOARD
+    return [
+        "X" if (game.x_bits >> i) & 1 else "O" if (game.o_bits >> i) & 1 else ""
+        for i in range(9)
     ]
 
-    for combo in winning_combinations:
-        if (
-            board[combo[0]] == board[combo[1]] == board[combo[2]]
-            and board[combo[0]] != ""
-        ):
-            return board[combo[0]]
 
-    # Check for tie
-    if "" not in board:
-        return "tie"
+def game_response(game_id, game, message):
+    """Build the response returned by the game endpoints
+
+    The response is constructed directly so FastAPI does not run the body
+    through response model validation or jsonable_encoder.
+    """
+    return ORJSONResponse(
+        {
+            "game_id": game_id,
+            "board": board_to_list(game),
+            "current_player": game.current_player,
+            "winner": game.winner,
+            "game_over": game.game_over,
+            "message": message,
+        }
+    )
+
+
+def move_error(move, detail, status_code=400):
+    """Reject a move without going through FastAPI's exception handling"""
+    return ORJSONResponse(
+        {"detail": detail, "game_id": move.game_id}, status_code=status_code
+    )
 
-    return None
+
+def game_key(game_id):
+    """Redis key under which a game is stored"""
+    return f"game:{game_id}"
 
 
 def create_new_game():
     """Create a new game instance"""
-    return GameState(
-        board=[""] * 9,
-        current_player="X",
-        winner=None,
-        game_over=False,
-        created_at=datetime.now(),
+    return GameState()
+
+
+@app.on_event("startup")
+async def open_redis():
+    """Create the Redis connection pool shared by all requests of this worker
+
+    The pool is blocking so that bursts beyond REDIS_MAX_CONNECTIONS wait for
+    a connection instead of failing with "Too many connections".
+    """
+    pool = redis.BlockingConnectionPool.from_url(
+        REDIS_URL, max_connections=REDIS_MAX_CONNECTIONS, timeout=REDIS_POOL_TIMEOUT
     )
+    app.state.redis = redis.Redis(connection_pool=pool)
+
+
+@app.on_event("shutdown")
+async def close_redis():
+    """Release the Redis connection pool"""
+    await app.state.redis.aclose()
+    await app.state.redis.connection_pool.disconnect()
+
+
+@app.on_event("startup")
+async def start_bot():
+    """Start the bot and point Telegram's webhook at this app, if configured
+
+    Failures are logged rather than raised so the game API comes up even
+    when Telegram is unreachable.
+    """
+    app.state.bot_application = None
+    if not (BOT_TOKEN and PUBLIC_URL):
+        return
+
+    # Every worker runs its own copy of the bot, so they share Telegram's
+    # bot-wide message rate between them. WEB_CONCURRENCY must match the
+    # real worker count, so it is logged to make a mismatch visible.
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    logger.info("Sharing the bot message rate between %d workers", workers)
+    application = build_application(processes=workers)
+    try:
+        await application.initialize()
+        await application.start()
+    except Exception:
+        logger.exception("Could not start the bot, serving the game API without it")
+        return
+    app.state.bot_application = application
+
+    # Workers start together; only the first one registers the webhook
+    if not await app.state.redis.set(WEBHOOK_LOCK_KEY, 1, nx=True, ex=WEBHOOK_LOCK_TTL):
+        return
+    try:
+        await application.bot.set_webhook(
+            url=f"{PUBLIC_URL}/telegram/webhook",
+            allowed_updates=Update.ALL_TYPES,
+            secret_token=WEBHOOK_SECRET,
+        )
+    except Exception:
+        logger.exception("Could not set the bot webhook")
+        # Let the next worker or restart try again
+        await app.state.redis.delete(WEBHOOK_LOCK_KEY)
+
+
+@app.on_event("shutdown")
+async def stop_bot():
+    """Stop the bot; the webhook stays set for the remaining workers"""
+    application = app.state.bot_application
+    if application is not None:
+        await application.stop()
+        await application.shutdown()
 
 
 @app.get("/")
@@ -80,288 +287,182 @@ async def read_root():
 @app.post("/api/new-game")
 async def new_game():
     """Create a new game"""
-    game_id = f"game_{len(games) + 1}_{int(datetime.now().timestamp())}"
-    games[game_id] = create_new_game()
-
-    return GameResponse(
-        game_id=game_id,
-        board=games[game_id].board,
-        current_player=games[game_id].current_player,
-        winner=games[game_id].winner,
-        game_over=games[game_id].game_over,
-        message="New game created!",
-    )
+    game_id = secrets.token_urlsafe(9)
+    game = create_new_game()
+    await app.state.redis.set(game_key(game_id), orjson.dumps(game), ex=GAME_TTL)
+
+    return game_response(game_id, game, "New game created!")
 
 
 @app.get("/api/game/{game_id}")
 async def get_game(game_id: str):
     """Get current game state"""
-    if game_id not in games:
+    raw = await app.state.redis.get(game_key(game_id))
+    if raw is None:
         raise HTTPException(status_code=404, detail="Game not found")
 
-    game = games[game_id]
-    return GameResponse(
-        game_id=game_id,
-        board=game.board,
-        current_player=game.current_player,
-        winner=game.winner,
-        game_over=game.game_over,
-        message="Game state retrieved",
-    )
+    game = GameState(**orjson.loads(raw))
+    return game_response(game_id, game, "Game state retrieved")
 
 
-@app.post("/api/move")
-async def make_move(move: MoveRequest):
+@app.post("/api/move", openapi_extra=msgspec_request_body(MoveRequest))
+async def make_move(request: Request):
     """Make a move in the game"""
-    if move.game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-
-    game = games[move.game_id]
-
-    if game.game_over:
-        raise HTTPException(status_code=400, detail="Game is already over")
-
-    if move.position < 0 or move.position > 8:
-        raise HTTPException(status_code=400, detail="Invalid position")
-
-    if game.board[move.position] != "":
-        raise HTTPException(status_code=400, detail="Position already taken")
-
-    if move.player != game.current_player:
-        raise HTTPException(status_code=400, detail="Not your turn")
-
-    # Make the move
-    game.board[move.position] = move.player
-
-    # Check for winner
-    winner = check_winner(game.board)
-    if winner:
-        game.winner = winner
-        game.game_over = True
-        if winner == "tie":
-            message = "It's a tie!"
-        else:
-            message = f"Player {winner} wins!"
-    else:
-        # Switch players
-        game.current_player = "O" if game.current_player == "X" else "X"
-        message = f"Player {game.current_player}'s turn"
-
-    return GameResponse(
-        game_id=move.game_id,
-        board=game.board,
-        current_player=game.current_player,
-        winner=game.winner,
-        game_over=game.game_over,
-        message=message,
-    )
+    # Decode and validate the body with msgspec rather than FastAPI's
+    # Pydantic-based body parsing
+    try:
+        move = msgspec.json.decode(await request.body(), type=MoveRequest)
+    except msgspec.DecodeError as exc:
+        return ORJSONResponse({"detail": str(exc)}, status_code=422)
+
+    key = game_key(move.game_id)
+
+    lock = game_locks.get(move.game_id)
+    if lock is None:
+        lock = game_locks[move.game_id] = asyncio.Lock()
+
+    async with lock:
+        # Optimistic transaction: retry if another request changed the game
+        # between our read and our write
+        async with app.state.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    if raw is None:
+                        return move_error(move, "Game not found", status_code=404)
+
+                    game = GameState(**orjson.loads(raw))
+
+                    if game.game_over:
+                        return move_error(move, "Game is already over")
+
+                    if ((game.x_bits | game.o_bits) >> move.position) & 1:
+                        return move_error(move, "Position already taken")
+
+                    if move.player != game.current_player:
+                        return move_error(move, "Not your turn")
+
+                    # Make the move
+                    if move.player == "X":
+                        game.x_bits |= 1 << move.position
+                    else:
+                        game.o_bits |= 1 << move.position
+
+                    # Check for winner
+                    winner = check_winner(game.x_bits, game.o_bits)
+                    if winner:
+                        game.winner = winner
+                        game.game_over = True
+                        if winner == "tie":
+                            message = "It's a tie!"
+                        else:
+                            message = f"Player {winner} wins!"
+                    else:
+                        # Switch players
+                        game.current_player = "O" if game.current_player == "X" else "X"
+                        message = f"Player {game.current_player}'s turn"
+
+                    pipe.multi()
+                    ttl = FINISHED_GAME_TTL if game.game_over else GAME_TTL
+                    pipe.set(key, orjson.dumps(game), ex=ttl)
+                    await pipe.execute()
+                    break
+                except WatchError:
+                    continue
+
+    return game_response(move.game_id, game, message)
+
+
+def is_reachable(x_bits, o_bits):
+    """Check whether a board can arise from moves played by the game's rules
+
+    X moves first and players alternate, so X has as many pieces as O or one
+    more. The game stops at the first line, so a line for X means X just
+    moved, a line for O means O just moved, and both cannot have one.
+    """
+    lead = x_bits.bit_count() - o_bits.bit_count()
+    if lead not in (0, 1):
+        return False
+    if HAS_LINE[x_bits]:
+        return lead == 1 and not HAS_LINE[o_bits]
+    if HAS_LINE[o_bits]:
+        return lead == 0
+    return True
 
 
-@app.get("/game", response_class=HTMLResponse)
-async def serve_game():
-    """Serve the game HTML page"""
-    html_content = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Tic-Tac-Toe</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script src="https://unpkg.com/axios/dist/axios.min.js"></script>
-    <style>
-        body {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }
-        .game-board {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 4px;
-            background: rgba(255, 255, 255, 0.1);
-            padding: 8px;
-            border-radius: 12px;
-            backdrop-filter: blur(10px);
-        }
-        .cell {
-            aspect-ratio: 1;
-            background: rgba(255, 255, 255, 0.9);
-            border: none;
-            border-radius: 8px;
-            font-size: 2rem;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.2s ease;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }
-        .cell:hover:not(:disabled) {
-            background: rgba(255, 255, 255, 1);
-            transform: scale(1.05);
-        }
-        .cell:disabled {
-            cursor: not-allowed;
-            opacity: 0.7;
-        }
-        .cell.x {
-            color: #e74c3c;
-        }
-        .cell.o {
-            color: #3498db;
-        }
-        .winner {
-            animation: pulse 1s infinite;
-        }
-        @keyframes pulse {
-            0% { transform: scale(1); }
-            50% { transform: scale(1.05); }
-            100% { transform: scale(1); }
-        }
-    </style>
-</head>
-<body class="flex items-center justify-center min-h-screen p-4">
-    <div class="max-w-md w-full bg-white/10 backdrop-blur-lg rounded-xl p-6 shadow-2xl">
-        <div class="text-center mb-6">
-            <h1 class="text-3xl font-bold text-white mb-2">Tic-Tac-Toe</h1>
-            <p id="status" class="text-white/80">Loading...</p>
-        </div>
-
-        <div id="gameBoard" class="game-board mb-6">
-            <!-- Game cells will be generated here -->
-        </div>
-
-        <div class="flex gap-4">
-            <button id="newGameBtn" class="flex-1 bg-green-500 hover:bg-green-600 text-white font-bold py-3 px-6 rounded-lg transition-colors">
-                New Game
-            </button>
-            <button id="resetBtn" class="flex-1 bg-red-500 hover:bg-red-600 text-white font-bold py-3 px-6 rounded-lg transition-colors">
-                Reset
-            </button>
-        </div>
-
-        <div class="mt-4 text-center text-white/60 text-sm">
-            <p>Player X starts first</p>
-        </div>
-    </div>
-
-    <script>
-        class TicTacToeGame {
-            constructor() {
-                this.gameId = null;
-                this.currentPlayer = 'X';
-                this.gameOver = false;
-                this.board = Array(9).fill('');
-                this.init();
-            }
-
-            init() {
-                this.createBoard();
-                this.bindEvents();
-                this.newGame();
-            }
-
-            createBoard() {
-                const gameBoard = document.getElementById('gameBoard');
-                gameBoard.innerHTML = '';
-
-                for (let i = 0; i < 9; i++) {
-                    const cell = document.createElement('button');
-                    cell.className = 'cell';
-                    cell.dataset.index = i;
-                    cell.addEventListener('click', () => this.makeMove(i));
-                    gameBoard.appendChild(cell);
-                }
-            }
-
-            bindEvents() {
-                document.getElementById('newGameBtn').addEventListener('click', () => this.newGame());
-                document.getElementById('resetBtn').addEventListener('click', () => this.resetGame());
-            }
-
-            async newGame() {
-                try {
-                    const response = await axios.post('/api/new-game');
-                    this.gameId = response.data.game_id;
-                    this.updateGameState(response.data);
-                } catch (error) {
-                    console.error('Error creating new game:', error);
-                    this.updateStatus('Error creating new game');
-                }
-            }
-
-            async makeMove(position) {
-                if (this.gameOver || this.board[position] !== '') {
-                    return;
-                }
-
-                try {
-                    const response = await axios.post('/api/move', {
-                        game_id: this.gameId,
-                        position: position,
-                        player: this.currentPlayer
-                    });
-
-                    this.updateGameState(response.data);
-                } catch (error) {
-                    console.error('Error making move:', error);
-                    this.updateStatus('Error making move');
-                }
-            }
-
-            updateGameState(gameData) {
-                this.board = gameData.board;
-                this.currentPlayer = gameData.current_player;
-                this.gameOver = gameData.game_over;
-
-                this.updateBoard();
-                this.updateStatus(gameData.message);
-            }
-
-            updateBoard() {
-                const cells = document.querySelectorAll('.cell');
-                cells.forEach((cell, index) => {
-                    cell.textContent = this.board[index];
-                    cell.disabled = this.board[index] !== '' || this.gameOver;
-
-                    // Add styling classes
-                    cell.classList.remove('x', 'o', 'winner');
-                    if (this.board[index] === 'X') {
-                        cell.classList.add('x');
-                    } else if (this.board[index] === 'O') {
-                        cell.classList.add('o');
-                    }
-
-                    if (this.gameOver) {
-                        cell.classList.add('winner');
-                    }
-                });
-            }
-
-            updateStatus(message) {
-                document.getElementById('status').textContent = message;
-            }
-
-            resetGame() {
-                this.gameId = null;
-                this.currentPlayer = 'X';
-                this.gameOver = false;
-                this.board = Array(9).fill('');
-                this.updateBoard();
-                this.updateStatus('Click "New Game" to start');
-            }
-        }
+def evaluate_boards(boards):
+    """Return the winner of each board
 
-        // Initialize the game when the page loads
-        document.addEventListener('DOMContentLoaded', () => {
-            new TicTacToeGame();
-        });
-    </script>
-</body>
-</html>
+    Raises ValueError naming the first board that no legal game can reach.
     """
-    return HTMLResponse(content=html_content)
+    winners = []
+    for index, board in enumerate(boards):
+        x_bits, o_bits = board_to_bits(board)
+        if not is_reachable(x_bits, o_bits):
+            raise ValueError(
+                f"Board cannot be reached by legal play - at `$.boards[{index}]`"
+            )
+        winners.append(check_winner(x_bits, o_bits))
+    return winners
+
+
+@app.post("/api/evaluate", openapi_extra=msgspec_request_body(EvaluateRequest))
+async def evaluate(request: Request):
+    """Report the winner of each board in a batch"""
+    try:
+        batch = msgspec.json.decode(await request.body(), type=EvaluateRequest)
+    except msgspec.DecodeError as exc:
+        return ORJSONResponse({"detail": str(exc)}, status_code=422)
+
+    try:
+        winners = evaluate_boards(batch.boards)
+    except ValueError as exc:
+        return ORJSONResponse({"detail": str(exc)}, status_code=422)
+
+    return ORJSONResponse({"winners": winners})
+
+
+@app.post("/telegram/webhook")
+async def telegram_webhook(request: Request):
+    """Receive an update pushed by Telegram"""
+    application = app.state.bot_application
+    # Telegram echoes the secret_token given to set_webhook in this header
+    secret = request.headers.get("x-telegram-bot-api-secret-token", "")
+    if application is None or not hmac.compare_digest(
+        secret.encode(), WEBHOOK_SECRET.encode()
+    ):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as exc:
+        return ORJSONResponse({"detail": str(exc)}, status_code=400)
+
+    update = Update.de_json(data, application.bot)
+    await application.update_queue.put(update)
+    return {"ok": True}
+
+
+@app.get("/game")
+async def serve_game(request: Request):
+    """Serve the game HTML page"""
+    if request.headers.get("if-none-match") == GAME_HTML_ETAG:
+        return Response(status_code=304, headers=GAME_HTML_HEADERS)
+    return HTMLResponse(GAME_HTML_BYTES, headers=GAME_HTML_HEADERS)
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=80)
+    # Multiple workers need the app as an import string so each process can
+    # load it; per-worker setup lives in the startup handlers
+    workers = int(os.getenv("WEB_CONCURRENCY", str(2 * os.cpu_count() + 1)))
+    # Exported so each worker knows its share of the bot's message rate
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=80,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+    )
@@ -0,0 +1,50 @@
+import asyncio
+import os
+
+from telegram import Update
+import uvicorn
+import uvloop
+
+from bot import BOT_TOKEN, PUBLIC_URL, build_application, configure_logging, logger
+from main import app
+
+
+async def main() -> None:
+    """Run the game API and the Telegram bot on one event loop."""
+    configure_logging()
+
+    if not BOT_TOKEN:
+        logger.error("BOT_TOKEN not found in environment variables")
+        return
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="0.0.0.0", port=int(os.getenv("PORT", "8000")), http="httptools"
+        )
+    )
+
+    if PUBLIC_URL:
+        # The app starts the bot itself and receives updates by webhook
+        logger.info("Starting web server with bot webhook...")
+        await server.serve()
+        return
+
+    # Start polling without blocking so uvicorn can share the loop
+    application = build_application()
+    await application.initialize()
+    await application.start()
+    await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+
+    logger.info("Starting bot and web server...")
+    try:
+        # Returns once uvicorn has handled SIGINT/SIGTERM and shut down
+        await server.serve()
+    finally:
+        await application.updater.stop()
+        await application.stop()
+        await application.shutdown()
+
+
+if __name__ == "__main__":
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        runner.run(main())